@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Migration script to make board child foreign keys ON DELETE CASCADE
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from config import Config
+
+# Initialize SQLAlchemy
+db = SQLAlchemy()
+
+# (table, column, referenced table) - deleting a board removes these rows server-side
+CASCADE_FOREIGN_KEYS = [
+    ('board_members', 'board_id', 'boards'),
+    ('expenses', 'board_id', 'boards'),
+    ('debts', 'board_id', 'boards'),
+    ('categories', 'board_id', 'boards'),
+    ('notifications', 'board_id', 'boards'),
+    ('invitations', 'board_id', 'boards'),
+    ('shopping_lists', 'board_id', 'boards'),
+    ('shopping_list_quick_items', 'board_id', 'boards'),
+    ('shopping_list_items', 'shopping_list_id', 'shopping_lists'),
+]
+
+def create_app_for_migration():
+    """Create Flask app for migration purposes"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    # Initialize PostgreSQL database
+    db.init_app(app)
+
+    return app
+
+def run_migration():
+    """Recreate board child foreign keys with ON DELETE CASCADE"""
+
+    print("🔄 Starting migration: Adding ON DELETE CASCADE to board foreign keys...")
+
+    # Initialize PostgreSQL app
+    app = create_app_for_migration()
+
+    with app.app_context():
+        try:
+            for table, column, ref_table in CASCADE_FOREIGN_KEYS:
+                # Find the existing FK constraint and its ON DELETE action ('c' = cascade)
+                result = db.session.execute(db.text("""
+                    SELECT con.conname, con.confdeltype
+                    FROM pg_constraint con
+                    JOIN pg_attribute a
+                      ON a.attrelid = con.conrelid AND a.attnum = ANY(con.conkey)
+                    WHERE con.contype = 'f'
+                      AND con.conrelid = CAST(:table AS regclass)
+                      AND con.confrelid = CAST(:ref_table AS regclass)
+                      AND a.attname = :column
+                """), {"table": table, "ref_table": ref_table, "column": column})
+
+                constraint = result.fetchone()
+
+                if constraint and constraint.confdeltype == 'c':
+                    print(f"ℹ️  {table}.{column} already cascades")
+                    continue
+
+                constraint_name = constraint.conname if constraint else f"{table}_{column}_fkey"
+                drop_clause = f"DROP CONSTRAINT {constraint_name}, " if constraint else ""
+
+                print(f"➕ Recreating {constraint_name} with ON DELETE CASCADE...")
+                db.session.execute(db.text(f"""
+                    ALTER TABLE {table}
+                    {drop_clause}ADD CONSTRAINT {constraint_name}
+                    FOREIGN KEY ({column}) REFERENCES {ref_table}(id) ON DELETE CASCADE
+                """))
+                print(f"✅ {table}.{column} now cascades")
+
+            # Commit the transaction
+            db.session.commit()
+
+            print("✅ Successfully added ON DELETE CASCADE to board foreign keys")
+            print("📝 DELETE FROM boards now removes all board data server-side")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            db.session.rollback()
+            return False
+        finally:
+            db.session.close()
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("🎉 Migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("💥 Migration failed!")
+        sys.exit(1)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Migration script to add indexes on the board_id foreign key columns used by clear_board.py
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from config import Config
+
+# Initialize SQLAlchemy
+db = SQLAlchemy()
+
+# (index name, table, column, partial-index predicate) - board_id filters used
+# when clearing a board, plus debts.expense_id so FK checks on expense deletes
+# don't seq-scan debts
+INDEXES = [
+    ('idx_debts_board_id', 'debts', 'board_id', None),
+    ('idx_expenses_board_id', 'expenses', 'board_id', None),
+    ('idx_categories_board_id', 'categories', 'board_id', None),
+    ('idx_notifications_board_id', 'notifications', 'board_id', None),
+    ('idx_debts_expense_id', 'debts', 'expense_id', None),
+    # Custom categories only - exactly the rows clear_board.py deletes
+    ('categories_board_id_custom_idx', 'categories', 'board_id', 'is_default = false'),
+]
+
+def create_app_for_migration():
+    """Create Flask app for migration purposes"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    # Initialize PostgreSQL database
+    db.init_app(app)
+
+    return app
+
+def run_migration():
+    """Create board_id FK indexes"""
+
+    print("🔄 Starting migration: Adding board_id indexes...")
+
+    # Initialize PostgreSQL app
+    app = create_app_for_migration()
+
+    with app.app_context():
+        try:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for index_name, table, column, predicate in INDEXES:
+                    where = f" WHERE {predicate}" if predicate else ""
+                    print(f"➕ Creating {index_name} on {table}({column}){where}...")
+                    conn.execute(db.text(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} ({column}){where}"
+                    ))
+                    print(f"✅ {index_name} ready")
+
+            print("✅ Successfully added board_id indexes")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("🎉 Migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("💥 Migration failed!")
+        sys.exit(1)
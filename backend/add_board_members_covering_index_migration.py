@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migration script to add a covering index for board_members lookups by user_id
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from config import Config
+
+# Initialize SQLAlchemy
+db = SQLAlchemy()
+
+# Carries the columns delete_user.py reads per membership, so the lookup can be
+# served by an index-only scan
+COVERING_INDEX = 'idx_board_members_user_board'
+COVERING_INDEX_SQL = f"""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS {COVERING_INDEX}
+    ON board_members (user_id) INCLUDE (board_id, role, is_default_board)
+"""
+
+# Plain user_id index from add_fk_indexes_migration.py - redundant once the covering one exists
+REDUNDANT_INDEX = 'idx_board_members_user_id'
+
+def create_app_for_migration():
+    """Create Flask app for migration purposes"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    # Initialize PostgreSQL database
+    db.init_app(app)
+
+    return app
+
+def run_migration():
+    """Create the board_members covering index"""
+
+    print("🔄 Starting migration: Adding board_members covering index...")
+
+    # Initialize PostgreSQL app
+    app = create_app_for_migration()
+
+    with app.app_context():
+        try:
+            # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                print(f"➕ Creating {COVERING_INDEX} on board_members(user_id) INCLUDE (board_id, role, is_default_board)...")
+                conn.execute(db.text(COVERING_INDEX_SQL))
+                print(f"✅ {COVERING_INDEX} ready")
+
+                print(f"➖ Dropping redundant {REDUNDANT_INDEX}...")
+                conn.execute(db.text(f"DROP INDEX CONCURRENTLY IF EXISTS {REDUNDANT_INDEX}"))
+                print(f"✅ {REDUNDANT_INDEX} dropped")
+
+            print("✅ Successfully added board_members covering index")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("🎉 Migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("💥 Migration failed!")
+        sys.exit(1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Migration script to add indexes on boards.name for board lookups by name:
+- a trigram index for ILIKE '%...%' searches (clear_board.py)
+- a LOWER(name) expression index for exact case-insensitive matches (delete_board.py)
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from config import Config
+
+# Initialize SQLAlchemy
+db = SQLAlchemy()
+
+def create_app_for_migration():
+    """Create Flask app for migration purposes"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    # Initialize PostgreSQL database
+    db.init_app(app)
+
+    return app
+
+def run_migration():
+    """Enable pg_trgm and create the boards.name lookup indexes"""
+
+    print("🔄 Starting migration: Adding board name indexes...")
+
+    # Initialize PostgreSQL app
+    app = create_app_for_migration()
+
+    with app.app_context():
+        try:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                print("➕ Enabling pg_trgm extension...")
+                conn.execute(db.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                print("✅ pg_trgm enabled")
+
+                print("➕ Creating boards_name_trgm index...")
+                conn.execute(db.text("""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS boards_name_trgm
+                    ON boards USING gin (name gin_trgm_ops)
+                """))
+                print("✅ boards_name_trgm ready")
+
+                print("➕ Creating boards_lower_name_idx index...")
+                conn.execute(db.text("""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS boards_lower_name_idx
+                    ON boards (LOWER(name))
+                """))
+                print("✅ boards_lower_name_idx ready")
+
+            print("✅ Successfully added board name indexes")
+            print("📝 Speeds up: WHERE name ILIKE '%...%'")
+            print("📝 Speeds up: WHERE LOWER(name) = LOWER(:board_name)")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("🎉 Migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("💥 Migration failed!")
+        sys.exit(1)
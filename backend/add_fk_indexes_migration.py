@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Migration script to index the foreign key columns used by the ON DELETE CASCADE
+rules (add_board_cascade_migration.py / add_user_cascade_migration.py) and by delete_user.py
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from config import Config
+
+# Initialize SQLAlchemy
+db = SQLAlchemy()
+
+# (index name, table, column, partial-index predicate) - every referencing column
+# a cascade has to look up; board_id on debts/expenses/categories/notifications
+# and debts.expense_id are already covered by add_board_id_indexes_migration.py,
+# board_members.user_id by add_board_members_covering_index_migration.py
+INDEXES = [
+    ('idx_boards_owner_id', 'boards', 'owner_id', None),
+    ('idx_board_members_board_id', 'board_members', 'board_id', None),
+    ('idx_expenses_created_by', 'expenses', 'created_by', None),
+    ('idx_expenses_paid_by', 'expenses', 'paid_by', None),
+    ('idx_debts_from_user_id', 'debts', 'from_user_id', None),
+    ('idx_debts_to_user_id', 'debts', 'to_user_id', None),
+    ('idx_categories_created_by', 'categories', 'created_by', None),
+    ('idx_notifications_user_id', 'notifications', 'user_id', None),
+    ('idx_notifications_created_by', 'notifications', 'created_by', None),
+    ('idx_invitations_board_id', 'invitations', 'board_id', None),
+    ('idx_invitations_invited_by', 'invitations', 'invited_by', None),
+    ('idx_shopping_lists_board_id', 'shopping_lists', 'board_id', None),
+    ('idx_shopping_list_quick_items_board_id', 'shopping_list_quick_items', 'board_id', None),
+    ('idx_shopping_list_items_shopping_list_id', 'shopping_list_items', 'shopping_list_id', None),
+]
+
+def create_app_for_migration():
+    """Create Flask app for migration purposes"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    # Initialize PostgreSQL database
+    db.init_app(app)
+
+    return app
+
+def run_migration():
+    """Create indexes on cascading foreign key columns"""
+
+    print("🔄 Starting migration: Adding foreign key indexes...")
+
+    # Initialize PostgreSQL app
+    app = create_app_for_migration()
+
+    with app.app_context():
+        try:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for index_name, table, column, predicate in INDEXES:
+                    where = f" WHERE {predicate}" if predicate else ""
+                    print(f"➕ Creating {index_name} on {table}({column}){where}...")
+                    conn.execute(db.text(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} ({column}){where}"
+                    ))
+                    print(f"✅ {index_name} ready")
+
+            print("✅ Successfully added foreign key indexes")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("🎉 Migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("💥 Migration failed!")
+        sys.exit(1)
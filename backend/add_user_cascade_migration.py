@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Migration script to make user-owned data foreign keys ON DELETE CASCADE
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from config import Config
+
+# Initialize SQLAlchemy
+db = SQLAlchemy()
+
+# (table, column, referenced table) - deleting a user removes these rows server-side.
+# Board child keys are handled by add_board_cascade_migration.py, so a user's
+# owned boards take their data with them. board_members.invited_by is left
+# alone on purpose - deleting an inviter must not remove other users' memberships.
+CASCADE_FOREIGN_KEYS = [
+    ('boards', 'owner_id', 'users'),
+    ('board_members', 'user_id', 'users'),
+    ('expenses', 'created_by', 'users'),
+    ('expenses', 'paid_by', 'users'),
+    ('debts', 'from_user_id', 'users'),
+    ('debts', 'to_user_id', 'users'),
+    ('debts', 'expense_id', 'expenses'),
+    ('categories', 'created_by', 'users'),
+    ('notifications', 'user_id', 'users'),
+    ('notifications', 'created_by', 'users'),
+    ('invitations', 'invited_by', 'users'),
+    ('push_tokens', 'user_id', 'users'),
+]
+
+def create_app_for_migration():
+    """Create Flask app for migration purposes"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    # Initialize PostgreSQL database
+    db.init_app(app)
+
+    return app
+
+def run_migration():
+    """Recreate user-owned data foreign keys with ON DELETE CASCADE"""
+
+    print("🔄 Starting migration: Adding ON DELETE CASCADE to user foreign keys...")
+
+    # Initialize PostgreSQL app
+    app = create_app_for_migration()
+
+    with app.app_context():
+        try:
+            for table, column, ref_table in CASCADE_FOREIGN_KEYS:
+                # Find the existing FK constraint and its ON DELETE action ('c' = cascade)
+                result = db.session.execute(db.text("""
+                    SELECT con.conname, con.confdeltype
+                    FROM pg_constraint con
+                    JOIN pg_attribute a
+                      ON a.attrelid = con.conrelid AND a.attnum = ANY(con.conkey)
+                    WHERE con.contype = 'f'
+                      AND con.conrelid = CAST(:table AS regclass)
+                      AND con.confrelid = CAST(:ref_table AS regclass)
+                      AND a.attname = :column
+                """), {"table": table, "ref_table": ref_table, "column": column})
+
+                constraint = result.fetchone()
+
+                if constraint and constraint.confdeltype == 'c':
+                    print(f"ℹ️  {table}.{column} already cascades")
+                    continue
+
+                constraint_name = constraint.conname if constraint else f"{table}_{column}_fkey"
+                drop_clause = f"DROP CONSTRAINT {constraint_name}, " if constraint else ""
+
+                print(f"➕ Recreating {constraint_name} with ON DELETE CASCADE...")
+                db.session.execute(db.text(f"""
+                    ALTER TABLE {table}
+                    {drop_clause}ADD CONSTRAINT {constraint_name}
+                    FOREIGN KEY ({column}) REFERENCES {ref_table}(id) ON DELETE CASCADE
+                """))
+                print(f"✅ {table}.{column} now cascades")
+
+            # Commit the transaction
+            db.session.commit()
+
+            print("✅ Successfully added ON DELETE CASCADE to user foreign keys")
+            print("📝 DELETE FROM users now removes all of the user's data server-side")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            db.session.rollback()
+            return False
+        finally:
+            db.session.close()
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        print("🎉 Migration completed successfully!")
+        sys.exit(0)
+    else:
+        print("💥 Migration failed!")
+        sys.exit(1)
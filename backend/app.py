@@ -11,6 +11,7 @@ import os
 import uuid
 import logging
 from werkzeug.utils import secure_filename
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 from PIL import Image
 import io
@@ -317,6 +318,12 @@ def create_app(config_name='default'):
     
     # Load configuration
     app.config.from_object(config[config_name])
+    config[config_name].validate()
+    
+    # Behind the Heroku router remote_addr is the router's IP - take the client
+    # IP from the trusted X-Forwarded-For hop (used by the per-IP rate limits)
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
     
     # Initialize extensions
     CORS(app, 
@@ -703,6 +710,7 @@ def create_app(config_name='default'):
             print("⚠️  B2 Storage Service failed to initialize, falling back to local storage")
     
     app.b2_service = b2_service
+    app.extensions['b2'] = b2_service
     
     # File upload function
     def upload_expense_image(file, user_id):
@@ -735,7 +743,7 @@ def create_app(config_name='default'):
                 # Create a compressed file wrapper that mimics FileStorage for B2
                 compressed_file_wrapper = create_file_storage_wrapper(compressed_file, file.filename, file.content_type)
                 
-                success, file_url, error = app.b2_service.upload_file(compressed_file_wrapper, 'expense_images', user_id)
+                success, file_url, error, _file_id = app.b2_service.upload_file(compressed_file_wrapper, 'expense_images', user_id)
                 if success:
                     print(f"✅ Successfully uploaded compressed image to B2: {file_url}")
                     return file_url
@@ -1346,7 +1354,10 @@ def create_app(config_name='default'):
         result = auth_manager.get_current_user()
         
         if result['valid']:
-            return jsonify(result), 200
+            # Let clients revalidate with If-None-Match and get a 304 when unchanged
+            response = jsonify(result)
+            response.add_etag()
+            return response.make_conditional(request)
         else:
             return jsonify({'error': result['error']}), result.get('code', 400)
 
@@ -4922,6 +4933,40 @@ def create_app(config_name='default'):
     # ADMIN ENDPOINTS - Broadcast Notifications
     # ==========================================
 
+    @app.route('/api/admin/broadcast-notification', methods=['HEAD'])
+    @require_auth
+    def preview_broadcast_notification():
+        """
+        Report how many users/devices a broadcast would reach (Admin only)
+        
+        Headers-only probe - nothing is sent. Counts are returned in the
+        X-Broadcast-Reach (users) and X-Broadcast-Devices headers.
+        """
+        from postgres_models import PushToken, User
+        from sqlalchemy import func
+        
+        try:
+            current_user = auth_manager.get_current_user()['user']
+            
+            # Check if user is admin
+            user = User.query.get(current_user['id'])
+            if not user or not hasattr(user, 'is_admin') or not user.is_admin:
+                return Response(status=403)
+            
+            devices, unique_users = postgres_db.session.query(
+                func.count(PushToken.id),
+                func.count(func.distinct(PushToken.user_id))
+            ).filter(PushToken.is_active == True).one()
+            
+            response = Response(status=200)
+            response.headers['X-Broadcast-Reach'] = str(unique_users)
+            response.headers['X-Broadcast-Devices'] = str(devices)
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error previewing broadcast notification: {e}")
+            return Response(status=500)
+    
     @app.route('/api/admin/broadcast-notification', methods=['POST'])
     @require_auth
     def send_broadcast_notification():
@@ -5016,13 +5061,15 @@ def create_app(config_name='default'):
                 .with_entities(PushToken.user_id).distinct().count()
             total_tokens = PushToken.query.filter_by(is_active=True).count()
             
-            return jsonify({
+            response = jsonify({
                 'total_users': total_users,
                 'users_with_notifications': users_with_tokens,
                 'users_without_notifications': total_users - users_with_tokens,
                 'total_active_devices': total_tokens,
                 'coverage_percentage': round((users_with_tokens / total_users * 100), 2) if total_users > 0 else 0
-            }), 200
+            })
+            response.add_etag()
+            return response.make_conditional(request)
             
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
@@ -9,8 +9,11 @@ from datetime import datetime, timedelta, timezone
 import re
 import os
 import random
+import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import sib_api_v3_sdk
+from limits import parse as parse_rate_limit, storage as limits_storage, strategies as limits_strategies
 from sib_api_v3_sdk.rest import ApiException
 from email_validator import validate_email, EmailNotValidError
 from models import UserRole, BoardPermission
@@ -18,6 +21,15 @@ from postgres_models import PostgreSQLDatabaseManager
 
 bcrypt = Bcrypt()
 
+logger = logging.getLogger(__name__)
+
+# Password reset requests allowed per email address and per client IP
+PASSWORD_RESET_EMAIL_LIMIT = parse_rate_limit("3/hour")
+PASSWORD_RESET_IP_LIMIT = parse_rate_limit("10/hour")
+
+# Background workers for sending emails outside the request
+_MAIL_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='mail')
+
 def init_auth(app):
     """Initialize authentication extensions"""
     bcrypt.init_app(app)
@@ -29,6 +41,7 @@ class AuthManager:
         # Initialize email verification
         # Remove in-memory storage - now using database
         self._init_brevo_client()
+        self._init_rate_limiter()
         
     def _init_brevo_client(self):
         """Initialize Brevo API client"""
@@ -48,6 +61,32 @@ class AuthManager:
             print(f"❌ Failed to initialize Brevo client: {e}")
             self.brevo_client = None
 
+    def _init_rate_limiter(self):
+        """Initialize the rate limiter used for password reset requests"""
+        # memory:// is per process - each gunicorn worker keeps its own counters, so
+        # set RATELIMIT_STORAGE_URL (e.g. redis://) for limits that hold across workers
+        storage_url = os.getenv('RATELIMIT_STORAGE_URL', 'memory://')
+        try:
+            self.rate_limiter = limits_strategies.FixedWindowRateLimiter(
+                limits_storage.storage_from_string(storage_url)
+            )
+        except Exception as e:
+            print(f"❌ Failed to initialize rate limit storage '{storage_url}': {e}, using memory")
+            storage_url = 'memory://'
+            self.rate_limiter = limits_strategies.FixedWindowRateLimiter(limits_storage.MemoryStorage())
+        
+        if storage_url.startswith('memory://'):
+            logger.warning(
+                "Password reset rate limits use in-process memory storage - limits are "
+                "per worker; set RATELIMIT_STORAGE_URL to share them across workers"
+            )
+
+    def _password_reset_allowed(self, email: str) -> bool:
+        """Count a password reset request against the per-email and per-IP limits"""
+        email_allowed = self.rate_limiter.hit(PASSWORD_RESET_EMAIL_LIMIT, 'password_reset', 'email', email)
+        ip_allowed = self.rate_limiter.hit(PASSWORD_RESET_IP_LIMIT, 'password_reset', 'ip', request.remote_addr or 'unknown')
+        return email_allowed and ip_allowed
+
     def register_user(self, user_data: dict) -> dict:
         """Register a new user"""
         # Convert email to lowercase
@@ -806,6 +845,14 @@ class AuthManager:
                     'code': 400
                 }
 
+            # Throttle before any DB or email work; the generic reply doesn't reveal whether the account exists
+            if not self._password_reset_allowed(email):
+                print(f"⚠️ Password reset rate limit exceeded for {email}")
+                return {
+                    'valid': True,
+                    'message': 'If the account exists, a password reset code was sent to your email'
+                }
+
             # Check if user exists
             user = self.db.get_user_by_email(email)
             if not user:
@@ -823,7 +870,7 @@ class AuthManager:
             reset_data = {
                 'email': email,
                 'verification_code': reset_code,
-                'expiry_time': (datetime.now() + timedelta(minutes=10)).isoformat(),  # 10 minutes
+                'expiry_time': datetime.now() + timedelta(minutes=10),  # 10 minutes, stored as DateTime
                 'attempts': 0,
                 'is_password_reset': True  # Flag to differentiate from registration
             }
@@ -834,17 +881,8 @@ class AuthManager:
             # Store the reset request
             self.db.store_pending_registration(f"reset_{email}", reset_data)
 
-            # Send reset email
-            email_sent = self._send_password_reset_email(email, reset_code, user.first_name)
-
-            if not email_sent:
-                # Clean up if email failed
-                self.db.delete_pending_registration(f"reset_{email}")
-                return {
-                    'valid': False,
-                    'error': 'Failed to send reset email',
-                    'code': 500
-                }
+            # Send reset email in the background; if it fails the code simply expires
+            _MAIL_POOL.submit(self._send_password_reset_email, email, reset_code, user.first_name)
 
             return {
                 'valid': True,
@@ -973,25 +1011,34 @@ class AuthManager:
                 'code': 500
             }
 
+def _get_request_board_id(view_kwargs: dict):
+    """Get board_id from the route, query string or JSON body, parsing the body only as a last resort"""
+    return (
+        view_kwargs.get('board_id')
+        or (request.view_args or {}).get('board_id')
+        or request.args.get('board_id')
+        or (request.get_json(silent=True, cache=True) or {}).get('board_id')
+    )
+
 # Decorators for route protection
 def require_auth(f):
     """Decorator to require authentication"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print("🔐 Auth: require_auth decorator called")
-        print("🔐 Auth: Request headers:", dict(request.headers))
+        logger.debug("Auth: require_auth called for %s", request.path)
+        logger.debug("Auth: request headers: %s", request.headers)
         
         # Allow OPTIONS requests for CORS preflight
         if request.method == 'OPTIONS':
-            print("🔐 Auth: OPTIONS request, allowing without auth")
+            logger.debug("Auth: OPTIONS request, allowing without auth")
             return f(*args, **kwargs)
             
         try:
             verify_jwt_in_request()
-            print("🔐 Auth: JWT verification successful")
+            logger.debug("Auth: JWT verification successful")
             return f(*args, **kwargs)
         except Exception as e:
-            print("🔐 Auth: JWT verification failed:", str(e))
+            logger.debug("Auth: JWT verification failed: %s", e)
             return jsonify({'error': 'Authentication required'}), 401
     return decorated_function
 
@@ -1003,7 +1050,7 @@ def require_board_access(permission: str = BoardPermission.READ.value):
             try:
                 verify_jwt_in_request()
                 current_user_id = get_jwt_identity()
-                board_id = kwargs.get('board_id') or request.args.get('board_id') or request.json.get('board_id')
+                board_id = _get_request_board_id(kwargs)
                 
                 if not board_id:
                     return jsonify({'error': 'Board ID is required'}), 400
@@ -1025,7 +1072,7 @@ def require_board_owner(f):
         try:
             verify_jwt_in_request()
             current_user_id = get_jwt_identity()
-            board_id = kwargs.get('board_id') or request.args.get('board_id') or request.json.get('board_id')
+            board_id = _get_request_board_id(kwargs)
             
             if not board_id:
                 return jsonify({'error': 'Board ID is required'}), 400
@@ -1046,7 +1093,7 @@ def require_board_admin(f):
         try:
             verify_jwt_in_request()
             current_user_id = get_jwt_identity()
-            board_id = kwargs.get('board_id') or request.args.get('board_id') or request.json.get('board_id')
+            board_id = _get_request_board_id(kwargs)
             
             if not board_id:
                 return jsonify({'error': 'Board ID is required'}), 400
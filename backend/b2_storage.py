@@ -5,47 +5,56 @@ Handles file uploads to Backblaze B2 cloud storage
 
 import os
 import uuid
+import base64
+import shutil
 import logging
+import tempfile
 from typing import Optional, Tuple
 from io import BytesIO
 from werkzeug.datastructures import FileStorage
 
 try:
-    # Try newer B2SDK versions first (2.0+)
-    try:
-        from b2sdk.v2 import InMemoryAccountInfo, B2Api
-        from b2sdk.v2.exception import B2Error, BucketIdNotFound, NonExistentBucket
-        B2_VERSION = "v2"
-    except ImportError:
-        # Fallback to v1
-        try:
-            from b2sdk.v1 import InMemoryAccountInfo, B2Api
-            from b2sdk.v1.exception import B2Error, BucketIdNotFound, NonExistentBucket
-            B2_VERSION = "v1"
-        except ImportError:
-            # Try older import style
-            try:
-                from b2sdk.account_info.in_memory import InMemoryAccountInfo
-                from b2sdk.api import B2Api
-                from b2sdk.exception import B2Error, BucketIdNotFound, NonExistentBucket
-                B2_VERSION = "legacy"
-            except ImportError:
-                # Try even older import style
-                from b2sdk.account_info import InMemoryAccountInfo
-                from b2sdk.b2_api import B2Api
-                from b2sdk.exception import B2Error, BucketIdNotFound, NonExistentBucket
-                B2_VERSION = "old"
-    
+    from b2sdk.v2 import InMemoryAccountInfo, B2Api, UploadSourceBytes, UploadSourceLocalFile
+    from b2sdk.v2.exception import B2Error, BucketIdNotFound, NonExistentBucket, Unauthorized
     B2_AVAILABLE = True
-    logging.info(f"B2SDK loaded successfully (version compatibility: {B2_VERSION})")
 except ImportError as e:
     B2_AVAILABLE = False
-    B2_VERSION = None
     logging.warning(f"B2SDK not available. Install with: pip install b2sdk. Error: {e}")
 
 # Use a more specific logger name to avoid conflicts
 logger = logging.getLogger('b2_storage')
 
+# Uploads up to this size are sent straight from memory; larger ones are
+# spooled to a temporary file so B2SDK can stream them in chunks
+SPOOL_MAX_SIZE = 256 * 1024
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+# Files above this size are uploaded as multi-part large files, with parts
+# sent concurrently by the B2Api upload thread pool
+LARGE_FILE_THRESHOLD = 10 * 1024 * 1024
+LARGE_FILE_MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_UPLOAD_WORKERS = 8
+
+def _sniff_content_type(head: bytes) -> str:
+    """
+    Detect an image content type from the file's leading magic bytes
+    
+    Args:
+        head: The first bytes of the file (16 are enough)
+        
+    Returns:
+        str: The detected MIME type, or 'application/octet-stream' if unknown
+    """
+    if head.startswith(b'\xff\xd8'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG'):
+        return 'image/png'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head.startswith(b'GIF8'):
+        return 'image/gif'
+    return 'application/octet-stream'
+
 class B2StorageService:
     """Service for handling Backblaze B2 storage operations"""
     
@@ -70,7 +79,7 @@ class B2StorageService:
         
         # Initialize B2 API
         self.info = InMemoryAccountInfo()
-        self.api = B2Api(self.info)
+        self.api = B2Api(self.info, max_upload_workers=MAX_UPLOAD_WORKERS)
         self._bucket = None
         self._authenticated = False
         
@@ -82,15 +91,10 @@ class B2StorageService:
             bool: True if authentication successful, False otherwise
         """
         try:
-            # Different authentication methods for different B2SDK versions
-            if B2_VERSION in ["v2", "v1"]:
-                self.api.authorize_account("production", self.application_key_id, self.application_key)
-            else:
-                # Older version might use different method
-                self.api.authorize_account("production", self.application_key_id, self.application_key)
+            self.api.authorize_account("production", self.application_key_id, self.application_key)
             
             self._authenticated = True
-            logger.info(f"Successfully authenticated with Backblaze B2 (B2SDK {B2_VERSION})")
+            logger.info("Successfully authenticated with Backblaze B2")
             return True
         except B2Error as e:
             logger.error(f"Failed to authenticate with B2: {e}")
@@ -101,6 +105,11 @@ class B2StorageService:
             self._authenticated = False
             return False
     
+    def _invalidate_session(self):
+        """Drop the cached authorization and bucket so the next call re-authenticates"""
+        self._bucket = None
+        self._authenticated = False
+    
     def _get_bucket(self):
         """Get or cache the B2 bucket"""
         if self._bucket is None:
@@ -113,7 +122,8 @@ class B2StorageService:
                     # Use bucket ID for faster access
                     self._bucket = self.api.get_bucket_by_id(self.bucket_id)
                 else:
-                    # Find bucket by name
+                    # Find bucket by name (costs an extra API call)
+                    logger.warning("B2_BUCKET_ID is not configured; resolving bucket by name. Set B2_BUCKET_ID to skip this lookup.")
                     self._bucket = self.api.get_bucket_by_name(self.bucket_name)
                     
                 logger.info(f"Successfully connected to bucket: {self.bucket_name}")
@@ -126,7 +136,31 @@ class B2StorageService:
         
         return self._bucket
     
-    def upload_file(self, file_obj: FileStorage, folder: str, user_id: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    def _make_upload_source(self, file_obj) -> Tuple[object, Optional[str], bytes]:
+        """
+        Build a B2 upload source for a file object
+        
+        Small files are uploaded from memory. Larger files are copied in chunks
+        to a temporary file which B2SDK then streams from disk.
+        
+        Args:
+            file_obj: The file object to upload
+            
+        Returns:
+            Tuple[object, Optional[str], bytes]: (upload_source, temp_file_path, head)
+            where head holds the first 16 bytes of the file
+        """
+        file_obj.seek(0)  # Reset file pointer
+        head = file_obj.read(SPOOL_MAX_SIZE + 1)
+        if len(head) <= SPOOL_MAX_SIZE:
+            return UploadSourceBytes(head), None, head[:16]
+        
+        with tempfile.NamedTemporaryFile(prefix='b2_upload_', delete=False) as temp_file:
+            temp_file.write(head)
+            shutil.copyfileobj(file_obj, temp_file, SPOOL_CHUNK_SIZE)
+        return UploadSourceLocalFile(temp_file.name), temp_file.name, head[:16]
+    
+    def upload_file(self, file_obj: FileStorage, folder: str, user_id: str) -> Tuple[bool, Optional[str], Optional[str], Optional[str]]:
         """
         Upload a file to B2 storage
         
@@ -136,15 +170,17 @@ class B2StorageService:
             user_id: User ID for unique filename generation
             
         Returns:
-            Tuple[bool, Optional[str], Optional[str]]: (success, file_url, error_message)
+            Tuple[bool, Optional[str], Optional[str], Optional[str]]: (success, file_url, error_message, file_id)
+            The file_id can be passed to delete_file_by_id to delete without a lookup.
         """
         try:
             if not file_obj or not file_obj.filename:
-                return False, None, "No file provided"
+                return False, None, "No file provided", None
             
             # Generate unique filename
             file_extension = file_obj.filename.rsplit('.', 1)[1].lower() if '.' in file_obj.filename else 'jpg'
-            unique_filename = f"{user_id}_{uuid.uuid4().hex}.{file_extension}"
+            unique_id = base64.b32encode(uuid.uuid4().bytes).rstrip(b'=').decode('ascii').lower()
+            unique_filename = f"{user_id}_{unique_id}.{file_extension}"
             
             # Construct full path in bucket
             file_path = f"{folder}/{unique_filename}"
@@ -152,28 +188,49 @@ class B2StorageService:
             # Get bucket
             bucket = self._get_bucket()
             
-            # Read file content
-            file_obj.seek(0)  # Reset file pointer
-            file_content = file_obj.read()
+            # Build an upload source without reading the whole file into memory
+            upload_source, temp_path, head = self._make_upload_source(file_obj)
+            
+            # Don't trust the client's content type - detect it from the file itself
+            content_type = _sniff_content_type(head)
             
-            # Upload to B2
-            file_info = bucket.upload_bytes(
-                data_bytes=file_content,
-                file_name=file_path,
-                content_type=file_obj.content_type or 'application/octet-stream'
-            )
+            # Upload to B2 (large files are split into parts uploaded in parallel)
+            upload_kwargs = {}
+            if upload_source.get_content_length() > LARGE_FILE_THRESHOLD:
+                upload_kwargs['min_part_size'] = LARGE_FILE_MIN_PART_SIZE
+            
+            def do_upload(target_bucket):
+                return target_bucket.upload(
+                    upload_source=upload_source,
+                    file_name=file_path,
+                    content_type=content_type,
+                    **upload_kwargs
+                )
+            
+            try:
+                try:
+                    file_info = do_upload(bucket)
+                except Unauthorized as e:
+                    # Auth token expired or invalid (InvalidAuthToken is a subclass) -
+                    # re-authenticate once and retry; other B2 errors won't succeed on retry
+                    logger.warning(f"B2 upload unauthorized ({e}), re-authenticating and retrying")
+                    self._invalidate_session()
+                    file_info = do_upload(self._get_bucket())
+            finally:
+                if temp_path:
+                    os.remove(temp_path)
             
             # Return a URL that points to the public uploads endpoint
             # This endpoint automatically handles B2 or local storage without requiring auth
             public_url = f"/api/uploads/expense_images/{unique_filename}"
             
             logger.info(f"Successfully uploaded file: {file_path} -> {public_url} (via public endpoint)")
-            return True, public_url, None
+            return True, public_url, None, file_info.id_
             
         except Exception as e:
             error_msg = f"Failed to upload file to B2: {str(e)}"
             logger.error(error_msg)
-            return False, None, error_msg
+            return False, None, error_msg, None
     
     def download_file(self, file_path: str) -> Tuple[bool, Optional[bytes], Optional[str]]:
         """
@@ -232,6 +289,31 @@ class B2StorageService:
             logger.error(error_msg)
             return False, error_msg
     
+    def delete_file_by_id(self, file_id: str, file_path: str) -> Tuple[bool, Optional[str]]:
+        """
+        Delete a file from B2 storage using its known file ID
+        
+        Skips the file info lookup done by delete_file.
+        
+        Args:
+            file_id: The B2 file ID returned by upload_file
+            file_path: The path of the file in the bucket (e.g., 'expense_images/user123_abc.jpg')
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (success, error_message)
+        """
+        try:
+            bucket = self._get_bucket()
+            bucket.delete_file_version(file_id, file_path)
+            
+            logger.info(f"Successfully deleted file: {file_path} ({file_id})")
+            return True, None
+            
+        except Exception as e:
+            error_msg = f"Failed to delete file from B2: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+    
     def list_recent_files(self, folder: str = "expense_images", limit: int = 10) -> Tuple[bool, list, Optional[str]]:
         """
         List recent files in the bucket
@@ -246,13 +328,12 @@ class B2StorageService:
         try:
             bucket = self._get_bucket()
             
-            # List files in the folder
-            file_versions = bucket.ls(folder_to_list=folder, latest_only=True, recursive=True)
+            # List files in the folder, asking B2 for no more than we need per page
+            file_versions = bucket.ls(folder_to_list=folder, latest_only=True, recursive=False, fetch_count=limit)
             
             files = []
-            count = 0
             for file_version, _ in file_versions:
-                if count >= limit:
+                if len(files) >= limit:
                     break
                 files.append({
                     'name': file_version.file_name,
@@ -260,7 +341,6 @@ class B2StorageService:
                     'upload_timestamp': file_version.upload_timestamp,
                     'file_id': file_version.id_
                 })
-                count += 1
             
             return True, files, None
             
@@ -280,8 +360,8 @@ class B2StorageService:
             
             bucket = self._get_bucket()
             
-            # Try to list a few files to verify access
-            success, files, error = self.list_recent_files(limit=3)
+            # Try to list a single file to verify access
+            success, files, error = self.list_recent_files(limit=1)
             if success:
                 file_count = len(files)
                 return True, f"Successfully connected to bucket: {bucket.name} (found {file_count} recent files)"
@@ -291,10 +371,16 @@ class B2StorageService:
         except Exception as e:
             return False, f"Connection test failed: {str(e)}"
 
+# Authenticated services shared process-wide, keyed by credentials and bucket
+_services = {}
+
 def create_b2_service(config) -> Optional[B2StorageService]:
     """
     Create B2 storage service from configuration
     
+    The service is cached per process, so repeated calls reuse the same
+    authenticated B2Api instance and bucket.
+    
     Args:
         config: Flask configuration object
         
@@ -310,6 +396,14 @@ def create_b2_service(config) -> Optional[B2StorageService]:
             logger.warning("B2 configuration incomplete. Required: B2_APPLICATION_KEY_ID, B2_APPLICATION_KEY, B2_BUCKET_NAME")
             return None
         
+        cache_key = (
+            config['B2_APPLICATION_KEY_ID'],
+            config['B2_BUCKET_NAME'],
+            config.get('B2_BUCKET_ID')
+        )
+        if cache_key in _services:
+            return _services[cache_key]
+        
         service = B2StorageService(
             application_key_id=config['B2_APPLICATION_KEY_ID'],
             application_key=config['B2_APPLICATION_KEY'],
@@ -321,6 +415,7 @@ def create_b2_service(config) -> Optional[B2StorageService]:
         success, message = service.test_connection()
         if success:
             logger.info(f"B2 Storage Service initialized: {message}")
+            _services[cache_key] = service
             return service
         else:
             logger.error(f"B2 Storage Service failed to initialize: {message}")
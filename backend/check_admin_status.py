@@ -6,8 +6,29 @@ Usage: python check_admin_status.py [--token-file <file>] [--token <token>]
 
 import os
 import sys
+import time
+import argparse
+from datetime import datetime
+import base64
+import hashlib
+import tempfile
+import threading
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 
 def load_token_from_file(filename: str = "jwt_token.txt"):
@@ -24,166 +45,297 @@ def load_token_from_file(filename: str = "jwt_token.txt"):
         return None
 
 
-def check_admin_status(token: str, base_url: str = "http://localhost:5000"):
+# Local cache of admin decisions per token, so repeat runs can skip admin probes
+_jwt_cache_path = os.path.expanduser('~/.homis_jwt_cache')
+
+# Cached entries are dropped this many seconds before the token expires
+JWT_CACHE_EXPIRY_BUFFER = 600
+
+# Probes run concurrently, so cache read-modify-write cycles are serialized
+_jwt_cache_lock = threading.Lock()
+
+
+def decode_jwt_unverified(token: str):
+    """Decode a JWT payload without verifying the signature (display/caching only)"""
+    try:
+        payload_segment = token.split('.')[1]
+        return json.loads(base64.urlsafe_b64decode(payload_segment + '=' * (-len(payload_segment) % 4)))
+    except Exception:
+        return None
+
+
+def decode_jwt_exp(token: str):
+    """Read the exp claim from a JWT without verifying it"""
+    try:
+        return int(decode_jwt_unverified(token)['exp'])
+    except Exception:
+        return None
+
+
+def _load_jwt_cache() -> dict:
+    """Load the JWT cache file, dropping entries that are about to expire"""
+    try:
+        with open(_jwt_cache_path, 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    
+    now = time.time()
+    return {
+        key: entry for key, entry in cache.items()
+        if entry.get('exp', 0) - JWT_CACHE_EXPIRY_BUFFER > now
+    }
+
+
+def _save_jwt_cache(cache: dict):
+    """Atomically write the JWT cache file, readable only by the current user"""
+    cache_dir = os.path.dirname(_jwt_cache_path)
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix='.homis_jwt_cache.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, _jwt_cache_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _token_cache_key(token: str, base_url: str) -> str:
+    # The same token can be used against several servers - keep their answers apart
+    return hashlib.sha256(f"{base_url.rstrip('/')}\n{token}".encode('utf-8')).hexdigest()
+
+
+def _get_token_cache_entry(token: str, base_url: str) -> dict:
+    """Return the cache entry for a token on a server (empty if not cached)"""
+    return _load_jwt_cache().get(_token_cache_key(token, base_url), {})
+
+
+def _update_token_cache_entry(token: str, base_url: str, updater):
+    """Apply updater to the token's cache entry and save it, keeping it until shortly before the token expires"""
+    exp = decode_jwt_exp(token)
+    if not exp:
+        return
+    
+    with _jwt_cache_lock:
+        try:
+            cache = _load_jwt_cache()
+            entry = cache.setdefault(_token_cache_key(token, base_url), {'exp': exp})
+            updater(entry)
+            _save_jwt_cache(cache)
+        except Exception as e:
+            print(f"⚠️  Failed to update JWT cache: {e}")
+
+
+def get_cached_admin_status(token: str, base_url: str):
+    """Return the cached admin decision for a token on a server, or None if not cached"""
+    return _get_token_cache_entry(token, base_url).get('is_admin')
+
+
+def cache_admin_status(token: str, base_url: str, is_admin: bool):
+    """Remember the admin decision for a token on a server"""
+    def updater(entry):
+        entry['is_admin'] = is_admin
+    _update_token_cache_entry(token, base_url, updater)
+
+
+def conditional_get(session, base_url: str, path: str):
     """
-    Check if user is admin and get notification stats
+    GET a JSON endpoint, revalidating a cached copy with If-None-Match
     
     Args:
-        token: JWT token
+        session: Authenticated HTTP client
         base_url: Backend server URL
+        path: Endpoint path, e.g. /api/auth/me
         
     Returns:
-        Admin status and stats
+        Tuple of (status_code, body); a 304 is returned as 200 with the cached body
+    """
+    url = f"{base_url}{path}"
+    token = session.headers['Authorization'].split(' ', 1)[1]
+    cached = _get_token_cache_entry(token, base_url).get('responses', {}).get(url)
+    headers = {'If-None-Match': cached['etag']} if cached else {}
+    
+    response = session.get(url, headers=headers, timeout=10)
+    
+    if response.status_code == 304 and cached:
+        return 200, cached['body']
+    if response.status_code != 200:
+        return response.status_code, None
+    
+    body = response.json()
+    etag = response.headers.get('ETag')
+    if etag:
+        def updater(entry):
+            entry.setdefault('responses', {})[url] = {'etag': etag, 'body': body}
+        _update_token_cache_entry(token, base_url, updater)
+    return 200, body
+
+
+def create_session(token: str):
     """
+    Create an HTTP client that shares one connection across all calls
     
-    print(f"🔍 Checking admin status...")
-    print(f"🌐 Server: {base_url}")
+    Uses httpx with HTTP/2 when available, so the concurrent probes are
+    multiplexed over a single connection; otherwise a keep-alive
+    requests.Session.
     
+    Args:
+        token: JWT token
+        
+    Returns:
+        httpx.Client or requests.Session with auth headers set
+    """
     headers = {
         'Authorization': f'Bearer {token}',
         'Accept': 'application/json'
     }
     
+    if HTTPX_AVAILABLE:
+        return httpx.Client(http2=HTTP2_AVAILABLE, headers=headers, timeout=10.0)
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(headers)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def check_admin_status(session, base_url: str = "http://localhost:5000", log=print):
+    """
+    Check if user is admin and get notification stats
+    
+    Args:
+        session: Authenticated HTTP client
+        base_url: Backend server URL
+        log: Output function - pass a list's append to collect the report instead
+        
+    Returns:
+        Admin status and stats (admin status is None if it couldn't be determined)
+    """
+    
+    log(f"🔍 Checking admin status...")
+    log(f"🌐 Server: {base_url}")
+    
     # Test 1: Check notification stats (admin only)
-    print("\n📊 Testing admin access...")
+    log("\n📊 Testing admin access...")
     try:
-        response = requests.get(f"{base_url}/api/admin/stats/notifications", headers=headers, timeout=10)
+        status_code, stats = conditional_get(session, base_url, "/api/admin/stats/notifications")
         
-        if response.status_code == 200:
-            stats = response.json()
-            print("✅ Admin access confirmed!")
-            print(f"👥 Total users: {stats.get('total_users', 0)}")
-            print(f"📱 Users with notifications: {stats.get('users_with_notifications', 0)}")
-            print(f"❌ Users without notifications: {stats.get('users_without_notifications', 0)}")
-            print(f"📲 Total active devices: {stats.get('total_active_devices', 0)}")
-            print(f"📈 Coverage: {stats.get('coverage_percentage', 0)}%")
+        if status_code == 200:
+            log("✅ Admin access confirmed!")
+            log(f"👥 Total users: {stats.get('total_users', 0)}")
+            log(f"📱 Users with notifications: {stats.get('users_with_notifications', 0)}")
+            log(f"❌ Users without notifications: {stats.get('users_without_notifications', 0)}")
+            log(f"📲 Total active devices: {stats.get('total_active_devices', 0)}")
+            log(f"📈 Coverage: {stats.get('coverage_percentage', 0)}%")
             
             return True, stats
-        elif response.status_code == 403:
-            print("❌ Access denied - User is not an admin!")
+        elif status_code == 403:
+            log("❌ Access denied - User is not an admin!")
             return False, None
         else:
-            print(f"❌ Unexpected response: {response.status_code}")
-            return False, None
+            log(f"❌ Unexpected response: {status_code}")
+            return None, None
             
     except Exception as e:
-        print(f"❌ Error checking admin status: {e}")
-        return False, None
+        log(f"❌ Error checking admin status: {e}")
+        return None, None
 
 
-def get_user_info(token: str, base_url: str = "http://localhost:5000"):
+def get_user_info(session, base_url: str = "http://localhost:5000", log=print):
     """Get current user information"""
     
-    print("\n👤 Getting user information...")
+    log("\n👤 Getting user information...")
     
     try:
-        response = requests.get(f"{base_url}/api/auth/me", headers={
-            'Authorization': f'Bearer {token}',
-            'Accept': 'application/json'
-        }, timeout=10)
+        status_code, user_data = conditional_get(session, base_url, "/api/auth/me")
         
-        if response.status_code == 200:
-            user_data = response.json()
-            print("✅ User info retrieved!")
-            print(f"📧 Email: {user_data.get('email', 'Unknown')}")
-            print(f"👤 Name: {user_data.get('first_name', '')} {user_data.get('last_name', '')}")
-            print(f"🆔 User ID: {user_data.get('id', 'Unknown')}")
-            print(f"🔐 Is Admin: {user_data.get('is_admin', False)}")
+        if status_code == 200:
+            log("✅ User info retrieved!")
+            log(f"📧 Email: {user_data.get('email', 'Unknown')}")
+            log(f"👤 Name: {user_data.get('first_name', '')} {user_data.get('last_name', '')}")
+            log(f"🆔 User ID: {user_data.get('id', 'Unknown')}")
+            log(f"🔐 Is Admin: {user_data.get('is_admin', False)}")
             return user_data
         else:
-            print(f"❌ Failed to get user info: {response.status_code}")
+            log(f"❌ Failed to get user info: {status_code}")
             return None
             
     except Exception as e:
-        print(f"❌ Error getting user info: {e}")
+        log(f"❌ Error getting user info: {e}")
         return None
 
 
-def test_broadcast_capability(token: str, base_url: str = "http://localhost:5000"):
+def get_token_user_info(payload: dict):
+    """Get current user information from the decoded token, without calling the server"""
+    
+    print("\n👤 User information (from token)...")
+    print(f"🆔 User ID: {payload.get('sub', 'Unknown')}")
+    if 'email' in payload:
+        print(f"📧 Email: {payload['email']}")
+    if 'is_admin' in payload:
+        print(f"🔐 Is Admin: {payload['is_admin']}")
+    print(f"⏰ Token expires: {datetime.fromtimestamp(payload['exp']).strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    return {
+        'id': payload.get('sub'),
+        'email': payload.get('email'),
+        'is_admin': payload.get('is_admin')
+    }
+
+
+def test_broadcast_capability(session, base_url: str = "http://localhost:5000", log=print):
     """Test if user can send broadcast notifications"""
     
-    print("\n📢 Testing broadcast capability...")
+    log("\n📢 Testing broadcast capability...")
     
     try:
-        # Try to send a test broadcast (dry run)
-        test_data = {
-            "title": "🧪 Admin Test",
-            "body": "Testing admin broadcast capability",
-            "data": {"type": "test", "dry_run": True}
-        }
-        
-        response = requests.post(
-            f"{base_url}/api/admin/broadcast-notification",
-            json=test_data,
-            headers={
-                'Authorization': f'Bearer {token}',
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            },
-            timeout=10
-        )
+        # Headers-only probe - reports the broadcast reach without sending anything
+        response = session.head(f"{base_url}/api/admin/broadcast-notification", timeout=10)
         
         if response.status_code == 200:
-            result = response.json()
-            print("✅ Broadcast capability confirmed!")
-            print(f"📱 Would reach {result.get('unique_users', 0)} users")
-            print(f"📲 On {result.get('devices_sent', 0)} devices")
+            log("✅ Broadcast capability confirmed!")
+            log(f"📱 Would reach {response.headers.get('X-Broadcast-Reach', 0)} users")
+            log(f"📲 On {response.headers.get('X-Broadcast-Devices', 0)} devices")
             return True
         elif response.status_code == 403:
-            print("❌ Broadcast denied - User is not an admin!")
+            log("❌ Broadcast denied - User is not an admin!")
             return False
         else:
-            print(f"❌ Broadcast test failed: {response.status_code}")
+            log(f"❌ Broadcast test failed: {response.status_code}")
             return False
             
     except Exception as e:
-        print(f"❌ Error testing broadcast: {e}")
+        log(f"❌ Error testing broadcast: {e}")
         return False
 
 
+parser = argparse.ArgumentParser(
+    description="Check admin status and notification stats",
+    epilog="Environment variables:\n"
+           "  BACKEND_URL=http://your-server.com  # Override default localhost:5000",
+    formatter_class=argparse.RawDescriptionHelpFormatter
+)
+token_group = parser.add_mutually_exclusive_group()
+token_group.add_argument('--token-file', metavar='FILE', help='load JWT token from file (default: jwt_token.txt)')
+token_group.add_argument('--token', metavar='JWT', help='JWT token to use')
+parser.add_argument('--refresh', action='store_true', help='fetch user info from /api/auth/me instead of decoding the token')
+
+
 def main():
     """Main function"""
     
-    if len(sys.argv) < 2:
-        print("Usage:")
-        print("  python check_admin_status.py")
-        print("  python check_admin_status.py --token-file <file>")
-        print("  python check_admin_status.py --token <jwt_token>")
-        print("")
-        print("Examples:")
-        print("  python check_admin_status.py")
-        print("  python check_admin_status.py --token-file jwt_token.txt")
-        print("  python check_admin_status.py --token eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...")
-        print("")
-        print("Environment variables:")
-        print("  BACKEND_URL=http://your-server.com  # Override default localhost:5000")
-        sys.exit(1)
+    args = parser.parse_args()
     
     # Get backend URL from environment or use default
     base_url = os.getenv('BACKEND_URL', 'http://localhost:5000')
     
-    # Get token
-    token = None
-    
-    # Check for token options
-    if '--token-file' in sys.argv:
-        token_file_index = sys.argv.index('--token-file')
-        if token_file_index + 1 < len(sys.argv):
-            token_file = sys.argv[token_file_index + 1]
-            token = load_token_from_file(token_file)
-        else:
-            print("❌ --token-file requires a filename")
-            sys.exit(1)
-    elif '--token' in sys.argv:
-        token_index = sys.argv.index('--token')
-        if token_index + 1 < len(sys.argv):
-            token = sys.argv[token_index + 1]
-        else:
-            print("❌ --token requires a JWT token")
-            sys.exit(1)
-    else:
-        # Try to load from default file
-        token = load_token_from_file()
+    # Get token from the command line, or from a token file (jwt_token.txt by default)
+    token = args.token or load_token_from_file(args.token_file or 'jwt_token.txt')
     
     if not token:
         print("❌ No token provided!")
@@ -196,18 +348,44 @@ def main():
     
     print(f"🔑 Using token: {token[:50]}...")
     
-    # Get user info
-    user_info = get_user_info(token, base_url)
+    # Reuse one connection for all requests
+    session = create_session(token)
     
-    # Check admin status
-    is_admin, stats = check_admin_status(token, base_url)
+    # Read user info from the token itself unless asked to refresh or it's about to expire
+    payload = decode_jwt_unverified(token)
+    exp = decode_jwt_exp(token)
+    use_token_info = not args.refresh and exp is not None and exp - time.time() >= JWT_CACHE_EXPIRY_BUFFER
+    
+    # A token already known not to be admin can skip the admin-only probes
+    if get_cached_admin_status(token, base_url) is False:
+        print("💾 Cached result: user is not an admin, skipping admin checks")
+        user_info = get_token_user_info(payload) if use_token_info else get_user_info(session, base_url)
+        is_admin, stats, can_broadcast = False, None, False
+    else:
+        # Run the independent probes concurrently (user info, admin status, broadcast);
+        # each collects its report so the output is printed in a fixed order
+        user_lines, admin_lines, broadcast_lines = [], [], []
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            user_future = None if use_token_info else executor.submit(get_user_info, session, base_url, user_lines.append)
+            admin_future = executor.submit(check_admin_status, session, base_url, admin_lines.append)
+            broadcast_future = executor.submit(test_broadcast_capability, session, base_url, broadcast_lines.append)
+            
+            user_info = get_token_user_info(payload) if use_token_info else user_future.result()
+            is_admin, stats = admin_future.result()
+            can_broadcast = broadcast_future.result()
+        
+        for lines in (user_lines, admin_lines, broadcast_lines):
+            if lines:
+                print("\n".join(lines))
+        
+        if is_admin is not None:
+            cache_admin_status(token, base_url, is_admin)
     
-    # Test broadcast capability
-    can_broadcast = test_broadcast_capability(token, base_url)
+    session.close()
     
     # Summary
     print(f"\n📋 Summary:")
-    print(f"👤 User: {user_info.get('email', 'Unknown') if user_info else 'Unknown'}")
+    print(f"👤 User: {(user_info.get('email') or user_info.get('id') or 'Unknown') if user_info else 'Unknown'}")
     print(f"🔐 Is Admin: {'✅ Yes' if is_admin else '❌ No'}")
     print(f"📢 Can Broadcast: {'✅ Yes' if can_broadcast else '❌ No'}")
     
@@ -26,26 +26,13 @@ def check_and_add_column():
     
     with app.app_context():
         try:
-            # Check if column exists
-            result = db.session.execute(db.text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'boards' AND column_name = 'budget_reset_time';
+            # Add the column if missing - one idempotent statement, no catalog lookup
+            db.session.execute(db.text("""
+                ALTER TABLE boards 
+                ADD COLUMN IF NOT EXISTS budget_reset_time TIME;
             """))
-            
-            exists = result.fetchone() is not None
-            print(f"📊 budget_reset_time column exists: {exists}")
-            
-            if not exists:
-                print("➕ Adding budget_reset_time column...")
-                db.session.execute(db.text("""
-                    ALTER TABLE boards 
-                    ADD COLUMN budget_reset_time TIME;
-                """))
-                db.session.commit()
-                print("✅ Column added successfully!")
-            else:
-                print("ℹ️  Column already exists")
+            db.session.commit()
+            print("✅ budget_reset_time column ensured present")
                 
             return True
             
@@ -5,25 +5,54 @@ Clean database script - removes all data except users
 
 import sys
 import os
+import time
 
 # Add the current directory to Python path so we can import from backend
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-try:
-    from flask import Flask
-    from postgres_models import db, PostgreSQLDatabaseManager, User, Board, BoardMember, Expense, Debt, Category, Notification, Invitation
-    from config import config
-    print("✅ Successfully imported PostgreSQL models")
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print("📁 Current working directory:", os.getcwd())
-    print("📁 Script directory:", current_dir)
-    sys.exit(1)
+# Output is collected and written in one go when stdout isn't a terminal (e.g. piped to a log)
+_log_buffer = []
+
+def log(message: str = ""):
+    """Print a line, buffering it when output is not interactive"""
+    if sys.stdout.isatty():
+        print(message)
+    else:
+        _log_buffer.append(message)
+
+def flush_log():
+    """Write out any buffered output with a single write"""
+    if _log_buffer:
+        sys.stdout.write('\n'.join(_log_buffer) + '\n')
+        sys.stdout.flush()
+        _log_buffer.clear()
+
 
 def clean_database():
-    """Clean all tables except users"""
-    print("🔧 Initializing Flask app and database connection...")
+    """
+    Clean all tables except users
+    
+    Tables that are wiped completely are emptied with a single TRUNCATE, which
+    takes an ACCESS EXCLUSIVE lock on them until the transaction commits - run
+    this only when the app isn't serving traffic.
+    """
+    # Heavy imports (Flask, SQLAlchemy, models) are deferred until they're needed
+    import_start = time.perf_counter()
+    try:
+        from flask import Flask
+        from sqlalchemy import delete
+        from postgres_models import db, User, Board, Category
+        from config import config
+        log(f"✅ Successfully imported PostgreSQL models ({time.perf_counter() - import_start:.2f}s)")
+    except ImportError as e:
+        log(f"❌ Import error: {e}")
+        log(f"📁 Current working directory: {os.getcwd()}")
+        log(f"📁 Script directory: {current_dir}")
+        flush_log()
+        sys.exit(1)
+    
+    log("🔧 Initializing Flask app and database connection...")
     
     # Create Flask app
     app = Flask(__name__)
@@ -35,67 +64,63 @@ def clean_database():
     with app.app_context():
         # Get current user count before cleaning
         users_before = User.query.count()
-        print(f"👥 Found {users_before} users (will be preserved)")
+        log(f"👥 Found {users_before} users (will be preserved)")
+        
+        # Tables wiped completely (TRUNCATE is O(1) regardless of row count)
+        tables_to_truncate = [
+            ('debts', 'התחשבנויות'),
+            ('expenses', 'הוצאות'),
+            ('notifications', 'התראות'),
+            ('invitations', 'הזמנות'),
+            ('board_members', 'חברי לוחות')
+        ]
         
-        # Clean all tables except users (in order to respect foreign keys)
-        tables_to_clean = [
-            (Debt, 'התחשבנויות'),
-            (Expense, 'הוצאות'),
-            (Notification, 'התראות'),
-            (Category, 'קטגוריות (לא ברירת מחדל)'),
-            (Invitation, 'הזמנות'),
-            (BoardMember, 'חברי לוחות'),
-            (Board, 'לוחות (לא ברירת מחדל)')
+        # Tables that keep some rows - default categories and global boards
+        tables_to_filter = [
+            (delete(Category).where(Category.is_default == False), 'קטגוריות (לא ברירת מחדל)'),
+            (delete(Board).where(Board.board_type != 'global'), 'לוחות (לא ברירת מחדל)')
         ]
         
-        for model_class, hebrew_name in tables_to_clean:
-            try:
-                if model_class == Category:
-                    # Only delete non-default categories
-                    count_before = model_class.query.filter_by(is_default=False).count()
-                    if count_before > 0:
-                        model_class.query.filter_by(is_default=False).delete()
-                        print(f"🗑️  נוקה: {hebrew_name} ({count_before} רשומות)")
-                    else:
-                        print(f"✅ ריק: {hebrew_name}")
-                elif model_class == Board:
-                    # Only delete non-global boards
-                    count_before = model_class.query.filter(Board.board_type != 'global').count()
-                    if count_before > 0:
-                        model_class.query.filter(Board.board_type != 'global').delete()
-                        print(f"🗑️  נוקה: {hebrew_name} ({count_before} רשומות)")
-                    else:
-                        print(f"✅ ריק: {hebrew_name}")
+        # Everything runs in a single transaction with one commit
+        try:
+            table_names = ', '.join(table_name for table_name, _ in tables_to_truncate)
+            db.session.execute(db.text(f"TRUNCATE {table_names} RESTART IDENTITY CASCADE"))
+            for _, hebrew_name in tables_to_truncate:
+                log(f"🗑️  נוקה: {hebrew_name}")
+            
+            for stmt, hebrew_name in tables_to_filter:
+                result = db.session.execute(stmt.execution_options(synchronize_session=False))
+                if result.rowcount > 0:
+                    log(f"🗑️  נוקה: {hebrew_name} ({result.rowcount} רשומות)")
                 else:
-                    count_before = model_class.query.count()
-                    if count_before > 0:
-                        model_class.query.delete()
-                        print(f"🗑️  נוקה: {hebrew_name} ({count_before} רשומות)")
-                    else:
-                        print(f"✅ ריק: {hebrew_name}")
-                
-                db.session.commit()
-            except Exception as e:
-                db.session.rollback()
-                print(f"❌ שגיאה בניקוי {hebrew_name}: {e}")
+                    log(f"✅ ריק: {hebrew_name}")
+            
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            log(f"❌ שגיאה בניקוי מסד הנתונים: {e}")
+            log("↩️  כל המחיקות בוטלו")
         
         # Verify users are still there
         users_after = User.query.count()
-        print(f"👥 משתמשים אחרי ניקוי: {users_after}")
+        log(f"👥 משתמשים אחרי ניקוי: {users_after}")
         
         if users_after == users_before:
-            print("✅ הניקוי הושלם בהצלחה! המשתמשים נשמרו.")
+            log("✅ הניקוי הושלם בהצלחה! המשתמשים נשמרו.")
         else:
-            print("❌ שגיאה: חלק מהמשתמשים נמחקו!")
+            log("❌ שגיאה: חלק מהמשתמשים נמחקו!")
         
-        print("\n🎯 המסד נתונים נקי וכולל רק משתמשים וקטגוריות ברירת מחדל.")
-        print("🚀 כעת תוכל לבדוק חישובי התחשבנויות עם נתונים חדשים.")
+        log("\n🎯 המסד נתונים נקי וכולל רק משתמשים וקטגוריות ברירת מחדל.")
+        log("🚀 כעת תוכל לבדוק חישובי התחשבנויות עם נתונים חדשים.")
 
 if __name__ == "__main__":
-    print("🧹 מנקה מסד נתונים...")
+    log("🧹 מנקה מסד נתונים...")
     try:
         clean_database()
     except Exception as e:
-        print(f"❌ שגיאה: {e}")
+        log(f"❌ שגיאה: {e}")
+        flush_log()
         import traceback
-        traceback.print_exc() 
\ No newline at end of file
+        traceback.print_exc()
+    finally:
+        flush_log()
@@ -5,36 +5,107 @@ Simple database cleaner - removes all data except users from JSON file
 
 import json
 import os
+import sys
+import shutil
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Output is collected and written in one go when stdout isn't a terminal (e.g. piped to a log)
+_log_buffer = []
+
+def log(message: str = ""):
+    """Print a line, buffering it when output is not interactive"""
+    if sys.stdout.isatty():
+        print(message)
+    else:
+        _log_buffer.append(message)
+
+def flush_log():
+    """Write out any buffered output with a single write"""
+    if _log_buffer:
+        sys.stdout.write('\n'.join(_log_buffer) + '\n')
+        sys.stdout.flush()
+        _log_buffer.clear()
+
+# orjson has no streaming API, so bigger files are streamed with ijson instead
+ORJSON_MAX_FILE_SIZE = 50 * 1024 * 1024
+
+def dump_json(data) -> bytes:
+    """Serialize data as 2-space indented UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def read_database(db_path):
+    """
+    Read the users table and per-table record counts from the database file
+    
+    Files up to 50MB are parsed in one go with orjson when it is installed.
+    Otherwise, with ijson installed, the file is streamed one top-level table
+    at a time, so only the users table is ever kept in memory.
+    
+    Returns:
+        tuple: (users_data, table_counts)
+    """
+    users_data = []
+    table_counts = {}
+    
+    with open(db_path, 'rb') as f:
+        if ORJSON_AVAILABLE and (os.path.getsize(db_path) <= ORJSON_MAX_FILE_SIZE or not IJSON_AVAILABLE):
+            tables = orjson.loads(f.read()).items()
+        elif IJSON_AVAILABLE:
+            tables = ijson.kvitems(f, '', use_float=True)
+        else:
+            tables = json.load(f).items()
+        
+        for table_name, table_data in tables:
+            table_counts[table_name] = len(table_data) if isinstance(table_data, (list, dict)) else 0
+            if table_name == 'users':
+                users_data = table_data
+    
+    return users_data, table_counts
 
 def clean_database():
     """Clean database JSON file, keeping only users"""
     db_path = 'backend/database.json'
     
     if not os.path.exists(db_path):
-        print("❌ Database file not found!")
+        log("❌ Database file not found!")
         return
     
-    print(f"🔍 Found database at: {db_path}")
+    log(f"🔍 Found database at: {db_path}")
     
-    # Read current database
+    # Read current database (only the users table is kept)
     try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            db_data = json.load(f)
-        print("✅ Database loaded successfully")
+        users_data, table_counts = read_database(db_path)
+        log("✅ Database loaded successfully")
     except Exception as e:
-        print(f"❌ Error reading database: {e}")
+        log(f"❌ Error reading database: {e}")
         return
     
     # Show current state
-    print("\n📊 Current database contents:")
-    for table_name, table_data in db_data.items():
-        count = len(table_data) if isinstance(table_data, list) else 0
-        print(f"  {table_name}: {count} records")
+    log("\n📊 Current database contents:")
+    for table_name, count in table_counts.items():
+        log(f"  {table_name}: {count} records")
     
     # Keep only users table
-    users_data = db_data.get('users', [])
     user_count = len(users_data)
     
+    # Nothing to clean - skip the backup and rewrite
+    if not any(count for table_name, count in table_counts.items() if table_name != 'users'):
+        log(f"\n✅ Database is already clean ({user_count} users, all other tables empty)")
+        return
+    
     # Create clean database with only users
     clean_db = {
         'users': users_data,
@@ -47,29 +118,34 @@ def clean_database():
         'invitations': []
     }
     
-    # Backup original file
+    # Backup original file (raw copy - the full database is never parsed into memory)
     backup_path = db_path + '.backup'
     try:
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            json.dump(db_data, f, ensure_ascii=False, indent=2)
-        print(f"💾 Backup saved to: {backup_path}")
+        shutil.copyfile(db_path, backup_path)
+        log(f"💾 Backup saved to: {backup_path}")
     except Exception as e:
-        print(f"⚠️  Could not create backup: {e}")
+        log(f"⚠️  Could not create backup: {e}")
     
-    # Write clean database
+    # Write clean database in one write, replacing the original atomically
     try:
-        with open(db_path, 'w', encoding='utf-8') as f:
-            json.dump(clean_db, f, ensure_ascii=False, indent=2)
-        print("✅ Database cleaned successfully!")
+        temp_path = db_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(dump_json(clean_db))
+        os.replace(temp_path, db_path)
+        log("✅ Database cleaned successfully!")
     except Exception as e:
-        print(f"❌ Error writing clean database: {e}")
+        log(f"❌ Error writing clean database: {e}")
         return
     
-    print(f"\n🎯 Results:")
-    print(f"  👥 Users preserved: {user_count}")
-    print(f"  🗑️  Other tables cleared")
-    print(f"\n🚀 Database is now clean and ready for testing!")
+    log(f"\n🎯 Results:")
+    log(f"  👥 Users preserved: {user_count}")
+    log(f"  🗑️  Other tables cleared")
+    log(f"\n🚀 Database is now clean and ready for testing!")
 
 if __name__ == "__main__":
-    print("🧹 Cleaning database (keeping only users)...")
-    clean_database() 
\ No newline at end of file
+    log("🧹 Cleaning database (keeping only users)...")
+    try:
+        clean_database()
+    finally:
+        flush_log()
+ 
\ No newline at end of file
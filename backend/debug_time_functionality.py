@@ -26,55 +26,35 @@ def debug_budget_reset_time():
     
     with app.app_context():
         try:
-            # Check if column exists
-            result = db.session.execute(db.text("""
-                SELECT column_name, data_type 
-                FROM information_schema.columns 
-                WHERE table_name = 'boards' AND column_name = 'budget_reset_time';
+            # Make sure the column exists (no-op if it already does)
+            db.session.execute(db.text("""
+                ALTER TABLE boards 
+                ADD COLUMN IF NOT EXISTS budget_reset_time TIME;
             """))
-            
-            column_info = result.fetchone()
-            
-            if column_info:
-                print(f"✅ Column exists: {column_info[0]} ({column_info[1]})")
-            else:
-                print("❌ Column does not exist - adding it...")
-                db.session.execute(db.text("""
-                    ALTER TABLE boards 
-                    ADD COLUMN budget_reset_time TIME;
-                """))
-                db.session.commit()
-                print("✅ Column added!")
+            print("✅ Column budget_reset_time present")
             
             # Test updating a board with time
             print("\n🧪 Testing board update with time...")
             
-            # Get first board
-            result = db.session.execute(db.text("SELECT id, name FROM boards LIMIT 1;"))
+            # Pick the first board, set the time and read it back in one round-trip
+            result = db.session.execute(db.text("""
+                UPDATE boards 
+                SET budget_reset_time = :time 
+                WHERE id = (SELECT id FROM boards ORDER BY id LIMIT 1)
+                RETURNING id, name, budget_reset_time;
+            """), {"time": "14:30"})
+            
             board = result.fetchone()
             
+            # DDL and update share one transaction - a single commit (one WAL flush)
+            db.session.commit()
+            
             if board:
-                board_id, board_name = board
-                print(f"📋 Testing with board: {board_name} (ID: {board_id})")
-                
-                # Update with time
-                db.session.execute(db.text("""
-                    UPDATE boards 
-                    SET budget_reset_time = :time 
-                    WHERE id = :board_id;
-                """), {"time": "14:30", "board_id": board_id})
-                
-                db.session.commit()
+                board_id, board_name, saved_time = board
+                print(f"📋 Tested with board: {board_name} (ID: {board_id})")
                 print("✅ Updated board with time 14:30")
-                
-                # Check if it was saved
-                result = db.session.execute(db.text("""
-                    SELECT budget_reset_time FROM boards WHERE id = :board_id;
-                """), {"board_id": board_id})
-                
-                saved_time = result.fetchone()
                 if saved_time:
-                    print(f"✅ Time saved successfully: {saved_time[0]}")
+                    print(f"✅ Time saved successfully: {saved_time}")
                 else:
                     print("❌ Time not found after save")
             else:
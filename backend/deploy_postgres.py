@@ -4,54 +4,122 @@ PostgreSQL deployment script for Heroku.
 This script helps automate the PostgreSQL deployment process.
 """
 import os
+import shutil
 import sys
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-def run_command(command, description=None):
-    """Run a shell command and return success status"""
+def resolve_command(command):
+    """Resolve argv[0] on PATH (picks up heroku.cmd on Windows without a shell)"""
+    return [shutil.which(command[0]) or command[0]] + list(command[1:])
+
+def run_command(command, description=None, stream=False, log=print):
+    """Run a command given as an argv list and return success status"""
     if description:
-        print(f"🔧 {description}...")
+        log(f"🔧 {description}...")
     
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        if stream:
+            # Let output go straight to the terminal instead of buffering it
+            subprocess.run(resolve_command(command), check=True, text=True)
+            return True
+        
+        result = subprocess.run(resolve_command(command), check=True, capture_output=True, text=True)
         if result.stdout:
-            print(result.stdout.strip())
+            log(result.stdout.strip())
         return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         if e.stderr:
-            print(f"Error details: {e.stderr.strip()}")
+            log(f"Error details: {e.stderr.strip()}")
+        return False
+    except FileNotFoundError as e:
+        log(f"❌ Error: {e}")
         return False
 
-def check_heroku_cli():
+def check_heroku_cli(log=print):
     """Check if Heroku CLI is installed"""
-    print("🔍 Checking Heroku CLI...")
-    return run_command("heroku --version", "Checking Heroku CLI")
+    log("🔍 Checking Heroku CLI...")
+    return run_command(["heroku", "--version"], "Checking Heroku CLI", log=log)
 
-def check_git():
+def check_git(log=print):
     """Check if git is available and repo is initialized"""
-    print("🔍 Checking Git...")
-    if not run_command("git --version", "Checking Git"):
+    log("🔍 Checking Git...")
+    if not run_command(["git", "--version"], "Checking Git", log=log):
         return False
     
-    if not run_command("git status", "Checking Git repository"):
-        print("💡 Make sure you're in a Git repository directory")
+    if not run_command(["git", "status"], "Checking Git repository", log=log):
+        log("💡 Make sure you're in a Git repository directory")
         return False
     
     return True
 
+def check_heroku_app(log=print):
+    """Check if the current directory is linked to a Heroku app"""
+    try:
+        app_info = subprocess.run(
+            resolve_command(["heroku", "apps:info", "--json"]), capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return False
+    return app_info.returncode == 0
+
+# (name, check, message shown when it fails)
+PRE_DEPLOYMENT_CHECKS = [
+    ("Heroku CLI", check_heroku_cli,
+     "❌ Please install Heroku CLI first: https://devcenter.heroku.com/articles/heroku-cli"),
+    ("Git", check_git, "❌ Git is required for deployment"),
+    ("Heroku app", check_heroku_app,
+     "❌ Not in a Heroku app directory. Run 'heroku create your-app-name' first"),
+]
+
+def run_check(name, check):
+    """Run one check, collecting its output instead of printing it"""
+    lines = []
+    ok = check(log=lines.append)
+    return name, ok, "\n".join(lines)
+
+def run_checks(checks):
+    """Run independent checks concurrently, then report them in order"""
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [executor.submit(run_check, name, check) for name, check, _ in checks]
+    
+    all_ok = True
+    for (_, _, failure_message), future in zip(checks, futures):
+        _, ok, message = future.result()
+        if message:
+            print(message)
+        if not ok:
+            print(failure_message)
+            all_ok = False
+    return all_ok
+
+def wait_for_database(attempts=30, delay=1):
+    """Poll `heroku pg:wait` until the database is provisioned"""
+    for _ in range(attempts):
+        # pg:wait blocks until provisioning finishes and returns at once if already up
+        try:
+            result = subprocess.run(resolve_command(["heroku", "pg:wait"]), capture_output=True, text=True)
+        except FileNotFoundError:
+            return False
+        if result.returncode == 0:
+            return True
+        time.sleep(delay)
+    return False
+
 def add_postgres_addon():
     """Add PostgreSQL addon to Heroku"""
     print("🐘 Adding PostgreSQL addon...")
-    success = run_command("heroku addons:create heroku-postgresql:hobby-dev", "Adding PostgreSQL addon")
+    success = run_command(["heroku", "addons:create", "heroku-postgresql:hobby-dev"], "Adding PostgreSQL addon")
     
     if success:
         print("⏳ Waiting for database to be ready...")
-        time.sleep(10)  # Wait for database to be provisioned
+        if not wait_for_database():
+            print("⚠️  Database not reported ready yet, continuing anyway")
         
         # Check database URL
-        run_command("heroku config:get DATABASE_URL", "Getting database URL")
+        run_command(["heroku", "config:get", "DATABASE_URL"], "Getting database URL")
     
     return success
 
@@ -60,26 +128,26 @@ def deploy_code():
     print("🚀 Deploying code to Heroku...")
     
     # Add all changes
-    if not run_command("git add .", "Adding changes to Git"):
+    if not run_command(["git", "add", "."], "Adding changes to Git"):
         return False
     
     # Commit changes
     commit_msg = "Add PostgreSQL support for Homis backend"
-    if not run_command(f'git commit -m "{commit_msg}"', "Committing changes"):
+    if not run_command(["git", "commit", "-m", commit_msg], "Committing changes"):
         print("ℹ️  No changes to commit or already committed")
     
     # Push to Heroku
-    return run_command("git push heroku main", "Pushing to Heroku")
+    return run_command(["git", "push", "heroku", "main"], "Pushing to Heroku")
 
 def initialize_database():
     """Initialize the PostgreSQL database on Heroku"""
     print("🗄️ Initializing database...")
     
-    success = run_command("heroku run python init_db.py init", "Initializing database")
+    success = run_command(["heroku", "run", "python", "init_db.py", "init"], "Initializing database")
     
     if success:
         # Check database status
-        run_command("heroku run python init_db.py check", "Checking database status")
+        run_command(["heroku", "run", "python", "init_db.py", "check"], "Checking database status")
     
     return success
 
@@ -91,9 +159,9 @@ def migrate_data():
         print("📋 Migrating data...")
         
         # Create backup first
-        if run_command("python migrate_data.py backup", "Creating local backup"):
+        if run_command([sys.executable, "migrate_data.py", "backup"], "Creating local backup"):
             # Run migration on Heroku
-            return run_command("heroku run python migrate_data.py migrate", "Migrating data on Heroku")
+            return run_command(["heroku", "run", "python", "migrate_data.py", "migrate"], "Migrating data on Heroku")
     
     return True
 
@@ -102,12 +170,12 @@ def check_deployment():
     print("✅ Checking deployment...")
     
     # Check app status
-    if not run_command("heroku ps", "Checking app status"):
+    if not run_command(["heroku", "ps"], "Checking app status"):
         return False
     
     # Check logs for any errors
     print("📝 Recent logs:")
-    run_command("heroku logs --tail --num=20", "Checking recent logs")
+    run_command(["heroku", "logs", "--num=20"], "Checking recent logs", stream=True)
     
     return True
 
@@ -116,19 +184,8 @@ def main():
     print("🚀 Homis PostgreSQL Deployment Script")
     print("=" * 50)
     
-    # Pre-deployment checks
-    if not check_heroku_cli():
-        print("❌ Please install Heroku CLI first: https://devcenter.heroku.com/articles/heroku-cli")
-        return False
-    
-    if not check_git():
-        print("❌ Git is required for deployment")
-        return False
-    
-    # Check if we're in a Heroku app
-    app_name = subprocess.run("heroku apps:info --json", shell=True, capture_output=True, text=True)
-    if app_name.returncode != 0:
-        print("❌ Not in a Heroku app directory. Run 'heroku create your-app-name' first")
+    # Pre-deployment checks - independent, so run them concurrently
+    if not run_checks(PRE_DEPLOYMENT_CHECKS):
         return False
     
     # Step 1: Add PostgreSQL addon
@@ -172,8 +229,7 @@ if __name__ == '__main__':
         command = sys.argv[1]
         
         if command == 'check':
-            check_heroku_cli()
-            check_git()
+            run_checks(PRE_DEPLOYMENT_CHECKS[:2])
         elif command == 'addon':
             add_postgres_addon()
         elif command == 'deploy':
@@ -27,28 +27,18 @@ def add_budget_reset_time_column():
     
     with app.app_context():
         try:
-            # Check if column already exists
-            result = db.session.execute(db.text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'boards' AND column_name = 'budget_reset_time';
-            """))
-            
-            exists = result.fetchone() is not None
-            
-            if exists:
-                print("ℹ️  budget_reset_time column already exists")
-                return True
+            # Fail fast instead of queueing behind long-running transactions on boards
+            db.session.execute(db.text("SET LOCAL lock_timeout = '5s'"))
             
-            # Add the column
+            # Add the column (no-op if it already exists)
             print("➕ Adding budget_reset_time column...")
             db.session.execute(db.text("""
                 ALTER TABLE boards 
-                ADD COLUMN budget_reset_time TIME;
+                ADD COLUMN IF NOT EXISTS budget_reset_time TIME;
             """))
             
             db.session.commit()
-            print("✅ Column added successfully!")
+            print("✅ Column is in place!")
             print("📝 Column details:")
             print("   - budget_reset_time: TIME (nullable)")
             print("   - Format: HH:MM (24-hour format)")
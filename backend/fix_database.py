@@ -3,6 +3,61 @@ from postgres_models import db as postgres_db
 from flask import Flask
 from config import DevelopmentConfig
 
+# Column definitions added by fix_database(), keyed by column name
+USERS_COLUMN_TYPES = {
+    'accepted_terms': "BOOLEAN NOT NULL DEFAULT FALSE",
+    'terms_accepted_at': "TIMESTAMP",
+    'terms_version_signed': "INTEGER",
+}
+
+DEBTS_COLUMN_TYPES = {
+    'original_amount': "FLOAT",
+    'paid_amount': "FLOAT DEFAULT 0.0",
+}
+
+# Debts backfilled per transaction - keeps row locks and WAL bursts short
+DEBTS_BACKFILL_BATCH_SIZE = 10000
+
+def migrate_debts_in_batches():
+    """Backfill original_amount/paid_amount on existing debts, committing each batch"""
+    print("🔄 Migrating existing debts data...")
+    
+    # Temp table lives for the session, so every batch must use this connection
+    with postgres_db.engine.connect() as connection:
+        with connection.begin():
+            connection.execute(postgres_db.text("""
+                CREATE TEMP TABLE debts_to_migrate AS
+                SELECT id, row_number() OVER (ORDER BY id) AS rn
+                FROM debts
+                WHERE original_amount IS NULL
+            """))
+            connection.execute(postgres_db.text("CREATE INDEX ON debts_to_migrate (rn)"))
+            total = connection.execute(postgres_db.text("SELECT COUNT(*) FROM debts_to_migrate")).scalar()
+        
+        print(f"🔄 {total} debt(s) to migrate")
+        migrated = 0
+        for lo in range(1, total + 1, DEBTS_BACKFILL_BATCH_SIZE):
+            with connection.begin():
+                result = connection.execute(postgres_db.text("""
+                    UPDATE debts d
+                    SET original_amount = d.amount,
+                        paid_amount = CASE 
+                            WHEN d.is_paid = true THEN d.amount 
+                            ELSE 0.0 
+                        END
+                    FROM debts_to_migrate m
+                    WHERE d.id = m.id
+                      AND m.rn >= :lo AND m.rn < :hi
+                      AND d.original_amount IS NULL
+                """), {"lo": lo, "hi": lo + DEBTS_BACKFILL_BATCH_SIZE})
+            migrated += result.rowcount
+            print(f"   Migrated {migrated}/{total} debt(s)")
+        
+        with connection.begin():
+            connection.execute(postgres_db.text("DROP TABLE debts_to_migrate"))
+    
+    print("✅ Debts data migrated successfully!")
+
 def fix_database():
     """Add missing columns to users table using the same connection method as app.py"""
     try:
@@ -30,7 +85,7 @@ def fix_database():
             print(f"🔍 Current columns in users table: {existing_columns}")
             
             # Check which columns are missing
-            required_columns = ['accepted_terms', 'terms_accepted_at', 'terms_version_signed']
+            required_columns = list(USERS_COLUMN_TYPES)
             missing_columns = [col for col in required_columns if col not in existing_columns]
             
             print(f"🔍 Missing columns in users table: {missing_columns}")
@@ -42,7 +97,7 @@ def fix_database():
             print(f"🔍 Current columns in debts table: {debts_existing_columns}")
             
             # Check which debt columns are missing
-            required_debt_columns = ['original_amount', 'paid_amount']
+            required_debt_columns = list(DEBTS_COLUMN_TYPES)
             missing_debt_columns = [col for col in required_debt_columns if col not in debts_existing_columns]
             
             if missing_debt_columns:
@@ -78,41 +133,16 @@ def fix_database():
                 if missing_columns:
                     print("🔧 Adding missing columns to users table...")
                     with postgres_db.engine.begin() as connection:
-                        # Add accepted_terms column
-                        if 'accepted_terms' not in existing_columns:
-                            print("➕ Adding accepted_terms column...")
-                            connection.execute(postgres_db.text("""
-                                ALTER TABLE users 
-                                ADD COLUMN accepted_terms BOOLEAN NOT NULL DEFAULT FALSE
-                            """))
-                            print("✅ Added accepted_terms column")
-                        
-                        # Add terms_accepted_at column
-                        if 'terms_accepted_at' not in existing_columns:
-                            print("➕ Adding terms_accepted_at column...")
-                            connection.execute(postgres_db.text("""
-                                ALTER TABLE users 
-                                ADD COLUMN terms_accepted_at TIMESTAMP
-                            """))
-                            print("✅ Added terms_accepted_at column")
+                        # One ALTER TABLE for all missing columns - a single lock and catalog update
+                        print(f"➕ Adding columns: {', '.join(missing_columns)}...")
+                        add_clauses = ", ".join(
+                            f"ADD COLUMN {name} {USERS_COLUMN_TYPES[name]}" for name in missing_columns
+                        )
+                        connection.execute(postgres_db.text(f"ALTER TABLE users {add_clauses}"))
+                        print(f"✅ Added columns: {', '.join(missing_columns)}")
                         
-                        # Add terms_version_signed column
-                        if 'terms_version_signed' not in existing_columns:
-                            print("➕ Adding terms_version_signed column...")
-                            connection.execute(postgres_db.text("""
-                                ALTER TABLE users 
-                                ADD COLUMN terms_version_signed INTEGER
-                            """))
-                            print("✅ Added terms_version_signed column")
-                        
-                        # Update existing users with default values
-                        print("🔄 Updating existing users with default values...")
-                        connection.execute(postgres_db.text("""
-                            UPDATE users 
-                            SET accepted_terms = FALSE, 
-                                terms_version_signed = NULL 
-                            WHERE accepted_terms IS NULL
-                        """))
+                        # No backfill needed - accepted_terms is NOT NULL DEFAULT FALSE, which
+                        # PostgreSQL 11+ applies to existing rows without rewriting them
                         
                         print("✅ Users table changes committed successfully!")
                 
@@ -120,37 +150,18 @@ def fix_database():
                 if missing_debt_columns:
                     print("🔧 Adding missing columns to debts table...")
                     with postgres_db.engine.begin() as connection:
-                        # Add original_amount column
-                        if 'original_amount' not in debts_existing_columns:
-                            print("➕ Adding original_amount column...")
-                            connection.execute(postgres_db.text("""
-                                ALTER TABLE debts 
-                                ADD COLUMN original_amount FLOAT
-                            """))
-                            print("✅ Added original_amount column")
-                        
-                        # Add paid_amount column
-                        if 'paid_amount' not in debts_existing_columns:
-                            print("➕ Adding paid_amount column...")
-                            connection.execute(postgres_db.text("""
-                                ALTER TABLE debts 
-                                ADD COLUMN paid_amount FLOAT DEFAULT 0.0
-                            """))
-                            print("✅ Added paid_amount column")
-                        
-                        # Migrate existing debts data
-                        print("🔄 Migrating existing debts data...")
-                        connection.execute(postgres_db.text("""
-                            UPDATE debts 
-                            SET original_amount = amount,
-                                paid_amount = CASE 
-                                    WHEN is_paid = true THEN amount 
-                                    ELSE 0.0 
-                                END
-                            WHERE original_amount IS NULL
-                        """))
+                        # One ALTER TABLE for all missing columns - a single lock and catalog update
+                        print(f"➕ Adding columns: {', '.join(missing_debt_columns)}...")
+                        add_clauses = ", ".join(
+                            f"ADD COLUMN {name} {DEBTS_COLUMN_TYPES[name]}" for name in missing_debt_columns
+                        )
+                        connection.execute(postgres_db.text(f"ALTER TABLE debts {add_clauses}"))
+                        print(f"✅ Added columns: {', '.join(missing_debt_columns)}")
                         
                         print("✅ Debts table changes committed successfully!")
+                    
+                    # Migrate existing debts data in short per-batch transactions
+                    migrate_debts_in_batches()
                 
                 # Create terms_versions table if it doesn't exist
                 if not terms_table_exists:
@@ -365,7 +365,7 @@ class Board(db.Model):
     id = Column(String, primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
     description = Column(Text, default='')
-    owner_id = Column(String, ForeignKey('users.id'), nullable=False)
+    owner_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
@@ -419,8 +419,8 @@ class BoardMember(db.Model):
     __tablename__ = 'board_members'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
-    user_id = Column(String, ForeignKey('users.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     role = Column(String(50), nullable=False)
     joined_at = Column(DateTime, default=datetime.utcnow)
     invited_by = Column(String, ForeignKey('users.id'), nullable=False)
@@ -455,13 +455,13 @@ class Expense(db.Model):
     __tablename__ = 'expenses'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     amount = Column(Float, nullable=False)
     category = Column(String(255), nullable=False)
     description = Column(Text, default='')
-    paid_by = Column(String, ForeignKey('users.id'), nullable=False)
+    paid_by = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     date = Column(DateTime, default=datetime.utcnow)
-    created_by = Column(String, ForeignKey('users.id'), nullable=False)
+    created_by = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_recurring = Column(Boolean, default=False)
@@ -508,10 +508,10 @@ class Debt(db.Model):
     __tablename__ = 'debts'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
-    expense_id = Column(String, ForeignKey('expenses.id'), nullable=False)
-    from_user_id = Column(String, ForeignKey('users.id'), nullable=False)
-    to_user_id = Column(String, ForeignKey('users.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    expense_id = Column(String, ForeignKey('expenses.id', ondelete='CASCADE'), nullable=False)
+    from_user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    to_user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     amount = Column(Float, nullable=False)
     description = Column(Text, default='')
     is_paid = Column(Boolean, default=False)
@@ -552,12 +552,12 @@ class Category(db.Model):
     __tablename__ = 'categories'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(255), nullable=False)
     icon = Column(String(255), default='ellipsis-horizontal')
     color = Column(String(50), default='#9370DB')
     image_url = Column(String(500), nullable=True)  # Add image URL field
-    created_by = Column(String, ForeignKey('users.id'), nullable=False)
+    created_by = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     is_default = Column(Boolean, default=False)
     is_custom = Column(Boolean, default=False)  # Add is_custom field
@@ -591,7 +591,7 @@ class ShoppingList(db.Model):
     __tablename__ = 'shopping_lists'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     date = Column(DateTime, nullable=True)
@@ -637,7 +637,7 @@ class ShoppingListItem(db.Model):
     __tablename__ = 'shopping_list_items'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    shopping_list_id = Column(String, ForeignKey('shopping_lists.id'), nullable=False)
+    shopping_list_id = Column(String, ForeignKey('shopping_lists.id', ondelete='CASCADE'), nullable=False)
     item_name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     is_completed = Column(Boolean, default=False, nullable=False)
@@ -675,7 +675,7 @@ class ShoppingListQuickItem(db.Model):
     __tablename__ = 'shopping_list_quick_items'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     item_name = Column(String(255), nullable=False)
     icon = Column(String(10), nullable=True)
     display_order = Column(Integer, nullable=False, default=0)
@@ -705,13 +705,13 @@ class Notification(db.Model):
     __tablename__ = 'notifications'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey('users.id'), nullable=False)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
+    user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     board_name = Column(String(255), nullable=False)
     expense_id = Column(String, nullable=True)
     expense_description = Column(Text, default='')
     amount = Column(Float, default=0)
-    created_by = Column(String, ForeignKey('users.id'), nullable=False)
+    created_by = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     created_by_name = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     is_read = Column(Boolean, default=False)
@@ -747,9 +747,9 @@ class Invitation(db.Model):
     __tablename__ = 'invitations'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    board_id = Column(String, ForeignKey('boards.id'), nullable=False)
+    board_id = Column(String, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
     email = Column(String(255), nullable=False)
-    invited_by = Column(String, ForeignKey('users.id'), nullable=False)
+    invited_by = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     role = Column(String(50), nullable=False)
     token = Column(String, unique=True, default=generate_uuid)
     expires_at = Column(DateTime, nullable=False)
@@ -818,7 +818,7 @@ class PushToken(db.Model):
     __tablename__ = 'push_tokens'
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
+    user_id = Column(String, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     expo_push_token = Column(String(500), nullable=False, unique=True, index=True)
     device_id = Column(String(255), nullable=False)
     device_name = Column(String(255), nullable=True)